@@ -33,21 +33,32 @@ Clase Bomba:
     Methods:
         - marcha(): Enciende la bomba.
         - parada(): Apaga la bomba.
-        - medir_corriente(): Mide la corriente utilizando el sensor ACS712.
-        - medir_temperatura(): Mide la temperatura utilizando el sensor DS18B20.
+        - medir_corriente(): Mide la corriente utilizando el sensor ACS712 (corrutina).
+        - iniciar_conversion(): Inicia la conversión de temperatura del sensor DS18B20 sin bloquear.
+        - leer_temperatura(): Lee la temperatura si la conversión terminó (None si todavía no).
+        - medir_temperatura(): Mide la temperatura utilizando el sensor DS18B20 (corrutina).
+        - supervisar(cambio): Tarea que mide la bomba mientras marcha y avisa si entra en falla.
+        - mostrar_mediciones(disp): Muestra la corriente y la temperatura medidas con la función disp.
         - falla(): Maneja una situación de falla.
 
 Funciones Adicionales:
 
+    - iniciar_captura(muestras): Muestrea la corriente con el ADC en modo continuo y DMA (MicroPython 1.20 o superior).
+    - detener_captura(): Detiene el muestreo por DMA y deja el ADC listo para machine.ADC.
     - display(linea1, linea2): Muestra información en una pantalla LCD.
+    - formatear(formato, *valores): Arma una línea del display con un único formateo '%'.
+    - mostrar(linea1, linea2): Muestra y guarda la pantalla de modo actual.
     - inicio(): Inicializa el sistema y muestra un mensaje de inicio.
     - verificar_manual(): Verifica si el modo de operación es manual.
     - verificar_bomba1(): Verifica el estado de la bomba 1.
-    - marcha_manual(): Inicia una bomba en modo manual.
+    - marcha_manual(es_manual): Inicia una bomba en modo manual.
     - verificar_flotante(): Verifica el estado del sensor flotante.
-    - marcha_auto(): Inicia una bomba en modo automático.
-    - verificar_falla(): Verifica si hay una falla en alguna de las bombas.
-    - main(): Función principal que ejecuta el ciclo de control.
+    - marcha_auto(es_manual): Inicia una bomba en modo automático.
+    - verificar_falla(): Verifica si hay una falla en alguna de las bombas y opera la bomba sana.
+    - al_cambiar_entrada(pin): Interrupción de los selectores y el flotante: despierta a control().
+    - control(): Tarea que enciende y apaga las bombas ante cada cambio.
+    - refrescar_display(): Tarea que alterna en el display el modo y las mediciones.
+    - main(): Función principal que lanza las tareas de control con uasyncio.
 
 Instrucciones de Uso:
 
@@ -57,24 +68,90 @@ Instrucciones de Uso:
 """
 
 
-from machine import I2C, Pin, ADC                 
+from machine import I2C, Pin, ADC, mem32          
 import utime							         
 from lcd_api import LcdApi                        
-from pico_i2c_lcd import I2cLcd                   
+from pico_i2c_lcd_fast import I2cLcd              
 import onewire							          
 from ds18x20 import DS18X20                       
 import binascii                                   
+import array
+import gc
+import uasyncio as asyncio
+try:
+    from rp2 import DMA
+except ImportError: # MicroPython anterior a 1.20: la corriente se muestrea por software.
+    DMA = None
 
 I2C_ADDR = 0x27   
 I2C_NUM_ROWS = 2  
 I2C_NUM_COLS = 16 
-i2c = I2C(0, scl = Pin(9), sda = Pin(8), freq = 400000)
+I2C_FREQ = 1000000 
+i2c = I2C(0, scl = Pin(9), sda = Pin(8), freq = I2C_FREQ)
+if I2C_ADDR not in i2c.scan(): # El módulo I2C no responde a 1 MHz: se vuelve a 400 kHz.
+    i2c = I2C(0, scl = Pin(9), sda = Pin(8), freq = 400000)
 lcd = I2cLcd(i2c, I2C_ADDR, I2C_NUM_ROWS, I2C_NUM_COLS)
 
 manual = Pin(12, Pin.IN, Pin.PULL_DOWN)
 flotante = Pin(11, Pin.IN, Pin.PULL_DOWN) 
 bomba1 = Pin(14, Pin.IN, Pin.PULL_DOWN)
 
+sensor_corriente = ADC(26) # ACS712 (único sensor de corriente, compartido por ambas bombas).
+CONVERSION = 3.3 / 65535
+TIEMPO_CONVERSION_MS = 750 # Conversión DS18B20 a 12 bits.
+
+# Registros del ADC del RP2040, para muestrear la corriente con DMA.
+ADC_CS = 0x4004c000
+ADC_FCS = 0x4004c008
+ADC_FIFO = 0x4004c00c
+ADC_DIV = 0x4004c010
+CS_EN = 0x01
+CS_START_MANY = 0x08 # AINSEL = 0 (GPIO26).
+FCS_EN = 0x01
+FCS_DREQ_EN = 0x08
+FCS_EMPTY = 0x100
+FCS_ERRORES = 0xc00 # UNDER y OVER, se limpian escribiendo 1.
+FCS_THRESH_1 = 1 << 24
+DREQ_ADC = 36
+MUESTREO_HZ = 5000
+
+if DMA is None:
+    MUESTRAS = 200 # Por software, cada 1 ms: 10 ciclos de red (50 Hz).
+    PERIODO_US = 1000
+    dma = None
+else:
+    MUESTRAS = 1024 # Por DMA, a 5 kHz: ~10 ciclos de red (50 Hz) sin usar la CPU.
+    dma = DMA()
+captura = asyncio.Lock() # El ADC y el canal DMA se usan de a una bomba por vez.
+
+def vaciar_fifo_adc() -> None:
+    while not mem32[ADC_FCS] & FCS_EMPTY:
+        mem32[ADC_FIFO]
+    return None
+
+
+def iniciar_captura(muestras:array.array) -> None:
+    # El ADC convierte en forma continua y el DMA copia cada lectura del FIFO a 'muestras'.
+    mem32[ADC_CS] = CS_EN
+    vaciar_fifo_adc()
+    mem32[ADC_DIV] = (48_000_000 // MUESTREO_HZ - 1) << 8
+    mem32[ADC_FCS] = FCS_EN | FCS_DREQ_EN | FCS_THRESH_1 | FCS_ERRORES
+    ctrl = dma.pack_ctrl(size = 1, inc_read = False, inc_write = True, treq_sel = DREQ_ADC)
+    dma.config(read = ADC_FIFO, write = muestras, count = len(muestras), ctrl = ctrl, trigger = True)
+    mem32[ADC_CS] = CS_EN | CS_START_MANY
+    return None
+
+
+def detener_captura() -> None:
+    # Deja el ADC como lo espera machine.ADC.
+    dma.active(0)
+    mem32[ADC_CS] = CS_EN
+    vaciar_fifo_adc()
+    mem32[ADC_FCS] = 0
+    mem32[ADC_DIV] = 0
+    return None
+
+
 # Para saber la dirección del sensor:
 # ow = onewire.OneWire(Pin(6)) # Crea un objeto onewire y prepara el pin 6 para usar el protocolo.
 # sensor = DS18X20(ow) # Define un sensor en ese pin.
@@ -82,6 +159,14 @@ bomba1 = Pin(14, Pin.IN, Pin.PULL_DOWN)
 # id_temp_bomba2 = binascii.unhexlify("28de2775d0013c89") 
 # En este caso, la dirección se averiguó previamente y acá solo se carga el valor.
 
+buses_temp = {} # Un único bus OneWire por pin, compartido por todos los sensores conectados a él.
+conversiones = {} # ticks_ms del último convert_temp() enviado a cada bus.
+
+def bus_temperatura(pin:int) -> DS18X20:
+    if pin not in buses_temp:
+        buses_temp[pin] = DS18X20(onewire.OneWire(Pin(pin)))
+    return buses_temp[pin]
+
 class Bomba:
     
 
@@ -95,10 +180,16 @@ class Bomba:
         self.__temp_falla = temp_falla
         self.__rele = Pin(pin_rele, Pin.OUT)
         self.__pin_sensor = pin_sensor
+        self.__sensor = bus_temperatura(pin_sensor)
         self.__estado_bomba = False
         self.__estado_falla = False
         self.__corriente = 0
         self.__temperatura = 0
+        self.__muestras = None if dma is None else array.array('H', bytes(2 * MUESTRAS)) # Buffer del DMA.
+        self.__umbral_falla = int((corriente_falla * .066 + 1.65) / CONVERSION) # corriente_falla en cuentas de read_u16().
+        self.__inicio_conversion = None
+        self.__etiqueta_corriente = 'I B%d: %%.1f A' % numero
+        self.__etiqueta_temperatura = 'Temp. B%d: %%d C' % numero
 
     def __str__(self) -> str:
         print(f'Bomba N°: {self.__numero}')
@@ -136,36 +227,110 @@ class Bomba:
         self.__estado_bomba = False
 
 
-    def medir_corriente(self) -> float|None:
-        corriente_leida = ADC(26)
-        CONVERSION = 3.3 / 65535
-        lista = []        
-        for i in range(1000):
-            reading = corriente_leida.read_u16() * CONVERSION
-            corriente = round((reading - 1.65) / .066, 1)
-            lista.append(corriente)
-            utime.sleep(.001)
-        if max(lista) >= self.__corriente_falla:
+    async def medir_corriente(self) -> float|None:
+        # Se sigue el pico de las lecturas crudas y solo se convierte a amperes al final.
+        # Si el pico ya supera el umbral de falla, se corta la medición sin completar la ventana.
+        pico = 0
+        umbral = self.__umbral_falla
+        if dma is None:
+            # Cada muestra tiene su instante fijo (ticks_add sobre el anterior), así las demoras
+            # de sleep o de las otras tareas no se acumulan y la ventana dura siempre lo mismo.
+            # Mientras se espera se cede el control a las otras tareas.
+            limite = utime.ticks_us()
+            for i in range(MUESTRAS):
+                lectura = sensor_corriente.read_u16()
+                if lectura > pico:
+                    pico = lectura
+                    if pico >= umbral:
+                        break
+                limite = utime.ticks_add(limite, PERIODO_US)
+                while utime.ticks_diff(limite, utime.ticks_us()) > 0:
+                    await asyncio.sleep_ms(0)
+        else:
+            # Mientras el DMA llena el buffer, se revisan las muestras que ya llegaron.
+            muestras = memoryview(self.__muestras)
+            revisadas = 0
+            async with captura:
+                iniciar_captura(self.__muestras)
+                while True:
+                    activo = dma.active()
+                    escritas = MUESTRAS - dma.count
+                    if escritas > revisadas:
+                        pico = max(pico, max(muestras[revisadas:escritas]) << 4) # El FIFO entrega 12 bits; read_u16() los escala a 16.
+                        revisadas = escritas
+                    if not activo or pico >= umbral:
+                        break
+                    await asyncio.sleep_ms(10)
+                detener_captura()
+        corriente = round((pico * CONVERSION - 1.65) / .066, 1)
+        if corriente >= self.__corriente_falla:
             self.falla()
             return None
         else:   
-            self.__corriente = max(lista)
+            self.__corriente = corriente
           
 
-    def medir_temperatura(self)-> int|None:
+    def iniciar_conversion(self) -> None:
+        # convert_temp() llega a todos los sensores del bus: si otra bomba ya
+        # la inició y sigue en curso, se reutiliza en lugar de reiniciarla.
         try:
-            ow = onewire.OneWire(Pin(self.__pin_sensor))
-            sensor = DS18X20(ow)
-            sensor.convert_temp()
-            utime.sleep (1)
-            temp = int(sensor.read_temp (self.__id_temp))
+            inicio = conversiones.get(self.__pin_sensor)
+            if inicio is None or utime.ticks_diff(utime.ticks_ms(), inicio) >= TIEMPO_CONVERSION_MS:
+                self.__sensor.convert_temp()
+                inicio = utime.ticks_ms()
+                conversiones[self.__pin_sensor] = inicio
+            self.__inicio_conversion = inicio
+        except:
+            self.__inicio_conversion = None
+            self.__sensor.ow.reset()
+
+
+    def leer_temperatura(self) -> int|None:
+        if self.__inicio_conversion is None:
+            return self.__temperatura
+        if utime.ticks_diff(utime.ticks_ms(), self.__inicio_conversion) < TIEMPO_CONVERSION_MS:
+            return None
+        self.__inicio_conversion = None
+        try:
+            temp = int(self.__sensor.read_temp (self.__id_temp))
             if temp >= self.__temp_falla:
                 self.falla()
-                return None
             else:
                 self.__temperatura = temp
+            return temp
         except:
-            ow.reset()
+            self.__sensor.ow.reset()
+            return self.__temperatura
+
+
+    async def medir_temperatura(self) -> int|None:
+        self.iniciar_conversion()
+        await asyncio.sleep_ms(TIEMPO_CONVERSION_MS)
+        temp = self.leer_temperatura()
+        while temp is None:
+            await asyncio.sleep_ms(10)
+            temp = self.leer_temperatura()
+        return temp
+
+
+    async def supervisar(self, cambio:asyncio.ThreadSafeFlag) -> None:
+        # Mientras la bomba marcha, mide corriente y temperatura en paralelo
+        # y avisa a la tarea de control si aparece una falla.
+        while True:
+            if self.__estado_bomba:
+                await asyncio.gather(self.medir_corriente(), self.medir_temperatura())
+                if self.__estado_falla:
+                    cambio.set()
+            await asyncio.sleep(1)
+
+
+    def mostrar_mediciones(self, disp) -> bool:
+        if self.__estado_falla:
+            return False
+        # display(ESTADOS[5], ESTADOS[7]) / display(ESTADOS[6], ESTADOS[8])
+        # RP Pico:
+        disp(formatear(self.__etiqueta_corriente, self.__corriente), formatear(self.__etiqueta_temperatura, self.__temperatura))
+        return True
 
 
     def falla(self) -> bool:
@@ -184,16 +349,69 @@ b2 = Bomba(2, binascii.unhexlify("28de2775d0013c89"), 13, 21, 6)
 #            f'I B2: {b2.medir_corriente():3.1f} A', f'Temp. B1: {b1.medir_temperatura():2d} °C', f'Temp. B2: {b2.medir_temperatura:2d} °C',
 #             'Esperando...', 'Falla en', 'ambas bombas', 'Llamar al', 'servicio técnico')
 
-ciclo = 0
+# Mensajes fijos del display, centrados una sola vez.
+MENSAJES = {
+    'manual': 'Modo: Manual'.center(16),
+    'auto': 'Modo: Auto'.center(16),
+    'b1_on': 'Bomba 1: ON'.center(16),
+    'b2_on': 'Bomba 2: ON'.center(16),
+    'esperando': 'Esperando...'.center(16),
+    'vacio': ''.center(16),
+    'falla_1': 'Falla en'.center(16),
+    'falla_2': 'ambas bombas'.center(16),
+    'falla_3': 'Llamar al'.center(16),
+    'falla_4': 'servicio técnico'.center(16),
+}
+MENSAJES_FALLA = ((MENSAJES['falla_1'], MENSAJES['falla_2']), (MENSAJES['falla_3'], MENSAJES['falla_4']))
+
+falla_doble = False # Ambas bombas en falla: el display alterna MENSAJES_FALLA cada 5 s.
+turno_b1 = True # True: el ciclo automático usa la bomba 1. Alterna en cada activación del flotante.
 flotante_previo = False
+lcd_actual = ['', ''] # Contenido actual de cada fila del display.
+pantalla = [MENSAJES['esperando'], MENSAJES['vacio']] # Pantalla de modo, que refrescar_display() alterna con las mediciones.
+cambio = asyncio.ThreadSafeFlag() # Se activa (también desde interrupciones) cuando cambia una entrada o aparece una falla.
+REBOTE_MS = 50 # Espera para que se asienten los contactos antes de leer las entradas.
 
 
 def display(linea1:str, linea2:str) -> None: # Poner tuplas que correspondan. Ej.: display((ESTADOS(0), ESTADOS(3)))
-    lcd.clear()
-    lcd.move_to(0,0)
-    lcd.putstr(linea1.center(16))
-    lcd.move_to(0,1)
-    lcd.putstr(linea2.center(16))
+    # Los MENSAJES y las líneas de formatear() ya vienen con 16 caracteres.
+    if len(linea1) != 16:
+        linea1 = linea1.center(16)[:16]
+    if len(linea2) != 16:
+        linea2 = linea2.center(16)[:16]
+    if linea1 == lcd_actual[0] and linea2 == lcd_actual[1]:
+        return None
+    for fila, linea in ((0, linea1), (1, linea2)):
+        anterior = lcd_actual[fila]
+        if len(anterior) != len(linea):
+            lcd.move_to(0, fila)
+            lcd.putstr(linea)
+        else:
+            # Solo se reescriben los tramos de caracteres que cambiaron.
+            col = 0
+            while col < len(linea):
+                if linea[col] == anterior[col]:
+                    col += 1
+                    continue
+                fin = col + 1
+                while fin < len(linea) and linea[fin] != anterior[fin]:
+                    fin += 1
+                lcd.move_to(col, fila)
+                lcd.putstr(linea[col:fin])
+                col = fin
+        lcd_actual[fila] = linea
+    return None
+
+
+def formatear(formato:str, *valores) -> str:
+    # Un solo '%' genera una única cadena, en lugar de una por cada '+'.
+    return (formato % valores)[:16].center(16)
+
+
+def mostrar(linea1:str, linea2:str) -> None:
+    pantalla[0] = linea1
+    pantalla[1] = linea2
+    display(linea1, linea2)
     return None
 
 
@@ -209,202 +427,155 @@ def inicio() -> None:
     lcd.move_to(1, 0)
     lcd.putstr('Esperando...')
     utime.sleep(3)
+    lcd_actual[0] = lcd_actual[1] = '' # Se escribió directo en el display: el próximo display() redibuja todo.
     return None
 
 
 def verificar_manual() -> bool:
-    if manual.value():
-        return True
-    return False
+    return manual.value() != 0
 
 
 def verificar_bomba1() -> bool:
-    if bomba1.value():
-        return True
-    return False
+    return bomba1.value() != 0
     
 
-def marcha_manual() -> bool:
-    if verificar_manual():
+async def marcha_manual(es_manual:bool) -> bool:
+    if es_manual:
         if verificar_bomba1():
-            b2.parada()
-            utime.sleep(1)
-            b1.marcha()
+            if not b1.estado_bomba:
+                b2.parada()
+                await asyncio.sleep(1)
+                b1.marcha()
             
             # display(ESTADOS[0], ESTADOS[3])
             # RP Pico:
-            display('Modo: Manual', 'Bomba 1: ON')
+            mostrar(MENSAJES['manual'], MENSAJES['b1_on'])
         else:
-            b1.parada()
-            utime.sleep(1)
-            b2.marcha()
+            if not b2.estado_bomba:
+                b1.parada()
+                await asyncio.sleep(1)
+                b2.marcha()
             # display(ESTADOS[0], ESTADOS[4])
             # RP Pico:
-            display('Modo: Manual', 'Bomba 2: ON')
+            mostrar(MENSAJES['manual'], MENSAJES['b2_on'])
         return True
     return False
 
 
 def verificar_flotante() -> bool:
     global flotante_previo
-    global ciclo
-    if flotante.value():
-        if not flotante_previo:
-            flotante_previo = True
-            ciclo += 1
-        return True
-    else:
-        if flotante_previo:
-            flotante_previo = False
-        return False
+    global turno_b1
+    activo = flotante.value() != 0
+    if activo and not flotante_previo:
+        turno_b1 = not turno_b1
+    flotante_previo = activo
+    return activo
 
 
-def marcha_auto() -> bool:
-    if not verificar_manual():
+async def marcha_auto(es_manual:bool) -> bool:
+    if not es_manual:
         if verificar_flotante():
-            if ciclo % 2 == 0:
-                b2.parada()
-                utime.sleep(1)
-                b1.marcha()
+            if turno_b1:
+                if not b1.estado_bomba:
+                    b2.parada()
+                    await asyncio.sleep(1)
+                    b1.marcha()
                 #display(ESTADOS[1], ESTADOS[3])
                 # RP Pico:
-                display('Modo: Auto', 'Bomba 1: ON')
+                mostrar(MENSAJES['auto'], MENSAJES['b1_on'])
             else:
-                b1.parada()
-                utime.sleep(1)
-                b2.marcha()
+                if not b2.estado_bomba:
+                    b1.parada()
+                    await asyncio.sleep(1)
+                    b2.marcha()
                 # display(ESTADOS[1], ESTADOS[4])
                 # RP Pico:
-                display('Modo: Auto', 'Bomba 2: ON')  
+                mostrar(MENSAJES['auto'], MENSAJES['b2_on'])  
         else:
             b1.parada()
             b2.parada()
             # display(ESTADOS[9], '')
             # RP Pico:
-            display('Esperando...', '')
+            mostrar(MENSAJES['esperando'], MENSAJES['vacio'])
         return True
     return False
 
 
-def verificar_falla() -> None:
+def verificar_falla() -> bool:
+    # Con una bomba en falla se ignora el selector manual: la otra trabaja según el flotante.
+    # Los mensajes de falla en ambas bombas los muestra refrescar_display().
+    global falla_doble
     if b1.estado_falla and b2.estado_falla:
         b1.parada()
         b2.parada()
-        while True:
-            # display(ESTADOS[-4], ESTADOS[-3]) 
-            # RP Pico:
-            display('Falla en', 'ambas bombas')
-            utime.sleep(5)
-            # display(ESTADOS[-2], ESTADOS[-1]) 
-            # RP Pico:
-            display('Llamar al', 'servivcio técnico')
-            utime.sleep(5)
+        falla_doble = True
     elif b1.estado_falla:
         b1.parada()
-        while True:
-            if verificar_flotante():
-                if not b2.estado_falla:
-                    b2.marcha()
-                    # display(ESTADOS[1], ESTADOS[4])
-                    # RP Pico:
-                    display('Modo: Auto', 'Bomba 2: ON')
-                    b2.medir_corriente()
-                    b2.medir_temperatura()
-                    if not b2.estado_falla:
-                        utime.sleep(2)
-                        # display(ESTADOS[6], ESTADOS[8])
-                        # RP Pico:
-                        corriente = 'I B2: ' + str(b2.corriente) + ' A'
-                        temperatura = 'Temp. B2: ' + str(b2.temperatura) + ' C'
-                        display(corriente, temperatura)
-                        utime.sleep(2)
-                else:
-                    while True:
-                        # display(ESTADOS[-4], ESTADOS[-3]) 
-                        # RP Pico:
-                        display('Falla en', 'ambas bombas')
-                        utime.sleep(5)
-                        # display(ESTADOS[-2], ESTADOS[-1]) 
-                        # RP Pico:
-                        display('Llamar al', 'servicio técnico')
-                        utime.sleep(5)
-            else:
-                b2.parada()
+        if verificar_flotante():
+            b2.marcha()
+            # display(ESTADOS[1], ESTADOS[4])
+            # RP Pico:
+            mostrar(MENSAJES['auto'], MENSAJES['b2_on'])
+        else:
+            b2.parada()
     elif b2.estado_falla:
         b2.parada()
-        while True:
-            if verificar_flotante():
-                if not b1.estado_falla:
-                    b1.marcha()
-                    # display(ESTADOS[1], ESTADOS[3])
-                    # RP Pico:
-                    display('Modo: Auto', 'Bomba 1: ON')
-                    b1.medir_corriente()
-                    b1.medir_temperatura()
-                    if not b1.estado_falla:
-                        utime.sleep(2)
-                        # display(ESTADOS[5], ESTADOS[7])
-                        # RP Pico:
-                        corriente = 'I B1: ' + str(b1.corriente) + ' A'
-                        temperatura = 'Temp. B1: ' + str(b1.temperatura) + ' C'
-                        display(corriente, temperatura)
-                        utime.sleep(2)
-                else:
-                    while True:
-                        # display(ESTADOS[-4], ESTADOS[-3]) 
-                        # RP Pico:
-                        display('Falla en', 'ambas bombas')
-                        utime.sleep(5)
-                        # display(ESTADOS[-2], ESTADOS[-1])
-                        # RP Pico:
-                        display('Llamar al', 'servicio técnico')
-                        utime.sleep(5)
-            else:
-                b1.parada()
+        if verificar_flotante():
+            b1.marcha()
+            # display(ESTADOS[1], ESTADOS[3])
+            # RP Pico:
+            mostrar(MENSAJES['auto'], MENSAJES['b1_on'])
+        else:
+            b1.parada()
     else:
-        return None
-    
+        return False
+    return True
+
+
+def al_cambiar_entrada(pin:Pin) -> None:
+    cambio.set()
+
+
+async def control() -> None:
+    while True:
+        await cambio.wait()
+        await asyncio.sleep_ms(REBOTE_MS)
+        if not verificar_falla():
+            es_manual = verificar_manual() # Una sola lectura del selector por pasada.
+            await marcha_manual(es_manual)
+            await marcha_auto(es_manual)
+
+
+async def refrescar_display() -> None:
+    vueltas = 0
+    while True:
+        vueltas += 1
+        if vueltas % 32 == 0:
+            gc.collect() # El driver del LCD ya no recolecta en cada escritura.
+        if falla_doble:
+            # display(ESTADOS[-4], ESTADOS[-3]) / display(ESTADOS[-2], ESTADOS[-1])
+            # RP Pico:
+            display(*MENSAJES_FALLA[(utime.ticks_ms() // 5000) & 1])
+            await asyncio.sleep_ms(500)
+            continue
+        display(pantalla[0], pantalla[1])
+        await asyncio.sleep(2)
+        for bomba in (b1, b2):
+            if bomba.estado_bomba and bomba.mostrar_mediciones(display):
+                await asyncio.sleep(2)
+
+
+async def tareas() -> None:
+    # Las entradas ya no se consultan periódicamente: cada flanco despierta a control().
+    for entrada in (manual, flotante, bomba1):
+        entrada.irq(trigger = Pin.IRQ_RISING | Pin.IRQ_FALLING, handler = al_cambiar_entrada)
+    cambio.set()
+    await asyncio.gather(b1.supervisar(cambio), b2.supervisar(cambio), control(), refrescar_display())
 
 
 def main() -> None:
-     inicio()
-     while True:
-        #print(ciclo)
-        marcha_manual()
-        marcha_auto()
-        b1_en_marcha = b1.estado_bomba
-        b2_en_marcha = b2.estado_bomba
-        if b1_en_marcha:
-            b1.medir_corriente()
-            b1.medir_temperatura()
-            if not b1.estado_falla:
-                utime.sleep(2)
-                # display(ESTADOS[5], ESTADOS[7])
-                # RP Pico:
-                corriente = 'I B1: ' + str(b1.corriente) + ' A'
-                temperatura = 'Temp. B1: ' + str(b1.temperatura) + ' C'
-                display(corriente, temperatura)
-               
-                utime.sleep(2)
-            else:
-                verificar_falla()
-        if b2_en_marcha:
-            b2.medir_corriente()
-            b2.medir_temperatura()
-            if not b2.estado_falla:
-                utime.sleep(2)
-                # display(ESTADOS[6], ESTADOS[8])
-                # RP Pico:
-                corriente = 'I B2: ' + str(b2.corriente) + ' A'
-                temperatura = 'Temp. B2: ' + str(b2.temperatura) + ' C'
-                display(corriente, temperatura)
-        
-                utime.sleep(2)
-            else:
-                verificar_falla()
-        
-        
- 
+    inicio()
+    asyncio.run(tareas())
 
 
 if __name__ == '__main__':
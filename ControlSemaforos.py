@@ -17,6 +17,7 @@ Clases:
 - Barrera: Representa la barrera infrarroja y su estado.
 
 Funciones:
+- calcular_tiempo: Convierte una lectura del ajuste de tiempo en segundos; se usa para armar la tabla TIEMPOS.
 - main: Función principal que inicializa una instancia de Barrera y una instancia de Semaforo, y
   controla el semáforo en un bucle infinito.
 
@@ -38,7 +39,7 @@ Clases:
     
     - Métodos:
         - __str__(): Retorna información sobre la tensión de las lámparas y del buzzer.
-        - regular_tiempo() -> float: Regula el tiempo de acuerdo a la lectura del ajuste de tiempo.
+        - regular_tiempo() -> float: Regula el tiempo de acuerdo a la lectura del ajuste de tiempo (tabla TIEMPOS).
         - leer_barrera() -> bool: Lee el estado de la barrera y espera si está sensando.
         - encender_luz_verde(): Enciende la luz verde.
         - apagar_luz_verde(): Apaga la luz verde.
@@ -56,9 +57,10 @@ Clases:
         - __estado (bool): Estado de la barrera (default: False).
 
     - Métodos:
-        - get_estado() -> str: Retorna el estado actual de la barrera.
+        - get_estado() -> str: Retorna el estado actual de la barrera (para mostrarlo; no usar en el bucle de control).
         - __str__(): Retorna información sobre el modelo, tensión de la barrera, tipo de salida y estado.
         - sensar() -> None: Actualiza el estado de la barrera basado en la lectura del pin.
+        - value() -> bool: Lee el pin de la barrera, actualiza el estado y lo retorna.
 
 Función Principal:
 
@@ -70,6 +72,7 @@ Función Principal:
 
 from machine import Pin, ADC
 import utime
+import array
 
 barrera = Pin(21, Pin.IN, Pin.PULL_DOWN)
 ajuste_tiempo = ADC(26)
@@ -78,6 +81,16 @@ buzzer_i = Pin(19, Pin.OUT)
 verde = Pin(18, Pin.OUT)  
 roja = Pin(17, Pin.OUT)  
 
+
+def calcular_tiempo(lectura:int) -> float:
+    if lectura <= 1000:
+        return round((lectura / 10) / 1000,2) 
+    else:
+        return round((lectura * .0224 + 100) / 1000,2)
+
+# Tiempo para cada uno de los 256 tramos de la lectura de 16 bits del ajuste (pasos de ~6 ms), calculado una vez.
+TIEMPOS = array.array('f', [calcular_tiempo(i << 8) for i in range(256)])
+
 class Semaforo:
     
     def __init__(self, barrera:object,tension_lamparas:str='220 VCA', tension_buzzer:str='12 VCC') -> None:
@@ -89,20 +102,14 @@ class Semaforo:
         return f'Tensión de lámparas: {self.__tension_lamparas}\nTensión de buzzer: {self.__tension_buzzer}'
     
     def regular_tiempo(self) -> float:
-        lectura = ajuste_tiempo.read_u16()
-        if lectura <= 1000:
-            return round((lectura / 10) / 1000,2) 
-        else:
-            return round((lectura * .0224 + 100) / 1000,2)
+        return TIEMPOS[ajuste_tiempo.read_u16() >> 8]
     
     
     def leer_barrera(self) -> bool:
-        if self.__barrera.get_estado() == 'Sensando':
-            utime.sleep(self.regular_tiempo())
-            if self.__barrera.get_estado() == 'Sensando':
-                return True
-            else:
-                return False
+        if not self.__barrera.value():
+            return False
+        utime.sleep(self.regular_tiempo())
+        return self.__barrera.value()
 
     
     def encender_luz_verde(self) -> None:
@@ -156,10 +163,11 @@ class Barrera:
         return f'Modelo: {self.__modelo}\Tensión de alimentación barrera: {self.__tension_barrera}\Tipo de salida: {self.__salida}\nEstado: {self.get_estado()}'
     
     def sensar(self) -> bool:
-        if barrera.value():
-            self.__estado = True
-        else:
-            self.__estado = False
+        self.value()
+
+    def value(self) -> bool:
+        self.__estado = barrera.value() != 0
+        return self.__estado
 
 def main() -> None:
     b1 = Barrera()
@@ -24,8 +24,11 @@ Funciones:
 - conectar_red_wifi(ssid, clave):
     Establece la conexión a una red WiFi utilizando el nombre de red (SSID) y la contraseña proporcionados.
 
+- sincronizar_hora():
+    Ajusta el reloj (RTC) de la placa con la hora de un servidor de tiempo en línea utilizando el protocolo NTP (Network Time Protocol).
+
 - obtener_hora():
-    Obtiene la hora actual de un servidor de tiempo en línea utilizando el protocolo NTP (Network Time Protocol).
+    Obtiene la hora actual del RTC, resincronizándolo por NTP una vez por hora.
 
 - activar_salida():
     Controla el encendido y apagado de la lámpara en función de la hora actual y el estado del interruptor físico.
@@ -51,6 +54,10 @@ from machine import Pin
 ent_manual = Pin(22, Pin.IN, Pin.PULL_DOWN)
 salida = Pin(20, Pin.OUT)
 
+INTERVALO_SINCRONIZACION_MS = 3_600_000 # Una consulta NTP por hora; entre consultas se usa el RTC.
+ultima_sincronizacion = None
+ultimo_estado_salida = None # Último valor escrito en la salida, para no repetir la escritura.
+
 
 def conectar_red_wifi(ssid, clave) -> None:
     sta_if = network.WLAN(network.STA_IF)
@@ -63,19 +70,31 @@ def conectar_red_wifi(ssid, clave) -> None:
     print('Conectado:', sta_if.ifconfig())
 
 
-def obtener_hora() -> None:
+def sincronizar_hora() -> bool:
+    global ultima_sincronizacion
     try:
-        ntptime.settime()  
-        return utime.localtime()
-    except OverflowError:
-        return None  
+        ntptime.settime()
+        ultima_sincronizacion = utime.ticks_ms()
+        return True
+    except (OverflowError, OSError):
+        return False
+
+
+def obtener_hora() -> tuple|None:
+    if ultima_sincronizacion is None or utime.ticks_diff(utime.ticks_ms(), ultima_sincronizacion) > INTERVALO_SINCRONIZACION_MS:
+        sincronizar_hora()
+    if ultima_sincronizacion is None: # El RTC nunca se ajustó: su hora no sirve.
+        return None
+    return utime.localtime()
 
 def activar_salida() -> None:
+    global ultimo_estado_salida
     hora = obtener_hora()
-    if (hora[3]-3 >= 0 and hora[3]-3 < 7) or (hora[3]-3 >= 19  and hora[3]-3 <= 23) or ent_manual.value():
-        salida.on()
-    else:
-        salida.off()
+    hora_local = (hora[3] - 3) % 24 # UTC-3
+    encender = hora_local < 7 or hora_local >= 19 or ent_manual.value() != 0
+    if encender != ultimo_estado_salida:
+        salida.value(encender)
+        ultimo_estado_salida = encender
 
         
     
@@ -85,6 +104,7 @@ if __name__ == '__main__':
     CLAVE_RED = '*********' # Reemplazar por la contraseña de la red.
     
     conectar_red_wifi(SSID_RED, CLAVE_RED)
+    sincronizar_hora()
     #hora = obtener_hora()
     #print('Hora actual (Año, Mes, Día, Hora, Minuto, Segundo, Día de la Semana, Día del Año):', hora)
     